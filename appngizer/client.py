@@ -5,9 +5,12 @@
     
     Currently there is only an implementation of a :class:`XMLClient`.    
 '''
+import copy
 import logging
 import requests
 import re
+
+from requests.adapters import HTTPAdapter
 import urllib, urlparse
 
 from lxml import etree
@@ -38,6 +41,8 @@ class Client(object):
         All further appNGizer clients will inherits from this class
     '''
     __metaclass__ = Singleton
+    # : Compiled XPath to find exception messages in an HTML error page
+    XPATH_HTML_EXCEPTION = etree.XPath('//pre[contains(text(),"Exception")]')
     
     def __init__(self, url, sharedsecret):
         '''
@@ -94,7 +99,7 @@ class Client(object):
                 # try to get exception message from html error page if exist
                 if response.text:
                     html_error = soupparser.fromstring(response.text)
-                    pre_childs = html_error.xpath('//pre[contains(text(),"Exception")]')
+                    pre_childs = self.XPATH_HTML_EXCEPTION(html_error)
                     pre_texts = []
                     for pre_text in pre_childs:
                         pre_texts.append(pre_text.text)
@@ -120,6 +125,9 @@ class Client(object):
     def request(self, method, path, pdata=None):
         '''Sends request to appNGizer instance
         
+        The response is set on a shallow copy of the client which is returned,
+        so concurrent requests from several threads do not overwrite each other.
+
         :param str method: HTTP method
         :param str path: url to appNGizer instance
         :param str pdata: data to send
@@ -127,8 +135,9 @@ class Client(object):
         '''
         url = self.validate_url(self.base_url + path)
         response = self.net.request(method, url, data=pdata)
-        self._process_response(response)
-        return self
+        client = copy.copy(self)
+        client._process_response(response)
+        return client
     def validate_url(self, url):
         '''Validates an url
         
@@ -143,6 +152,9 @@ class XMLClient(Client):
     '''
         appNGizer XML Client class
     '''
+    # : Parser options for XML responses, drop blank text and skip the ID hash
+    XML_PARSER_OPTIONS = dict(remove_blank_text=True, collect_ids=False, huge_tree=False)
+
     def __init__(self, url, sharedsecret):
         '''
         :param str url: url to an appNGizer instance
@@ -156,20 +168,47 @@ class XMLClient(Client):
         self.response = None
         self.response_transf = None
 
+    @property
+    def response_transf(self):
+        '''Transformed response, parsed on first access only
+
+        The entities parse the response content themselves, so it is not
+        parsed in advance for every request.
+
+        :return: :class:`lxml.etree.Element` (content as it is for status 204)
+        '''
+        if self._response_transf is None and self.response is not None and self.response.text != '':
+            if self.response.status_code == 204:
+                self._response_transf = self.response.content
+            else:
+                parser = etree.XMLParser(**self.XML_PARSER_OPTIONS)
+                self._response_transf = etree.fromstring(self.response.content, parser=parser)
+        return self._response_transf
+
+    @response_transf.setter
+    def response_transf(self, value):
+        self._response_transf = value
+
     def _transform_response(self):
-        '''Transforms and set response attribute
+        '''Reset transformed response, it is parsed on first access of response_transf
         '''
-        if self.response.status_code == 204:
-            self.response_transf = self.response.content
-        else:
-            self.response_transf = etree.fromstring(self.response.content)
+        self._response_transf = None
 
 class ClientNetwork(object):
     '''
         appNGizer ClientNetwork class
     '''
+    # : Number of connection pools (one per host) kept by the session
+    POOL_CONNECTIONS = 4
+    # : Maximum number of keep-alive connections per pool
+    POOL_MAXSIZE = 16
+    
     def __init__(self):
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.POOL_CONNECTIONS, 
+                              pool_maxsize=self.POOL_MAXSIZE, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     def __del__(self):
         self.session.close()
         
@@ -5,15 +5,14 @@
 '''
 import sys
 import os
-import logging
-import bcrypt
+import time
 import hashlib
-import re
+import logging
 
 from copy import deepcopy
 from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 from requests import Response
-from requests.api import request
 from distutils.version import LooseVersion
 
 from lxml import etree
@@ -25,35 +24,115 @@ from appngizer.client import XMLClient
 
 log = logging.getLogger(__name__)
 
+# : Parser options for appNGizer responses, drop blank text and comments
+_APPNG_PARSER_OPTIONS = dict(remove_blank_text=True, remove_comments=True,
+                             collect_ids=False, huge_tree=False, ns_clean=True)
+
+def _make_appng_parser():
+    '''Return a new parser for appNGizer responses
+
+    Creating a parser is cheap, while lxml serializes parsing on a parser
+    shared between the threads of :func:`_pool_map`.
+
+    :return: lxml.etree.XMLParser
+    '''
+    return objectify.makeparser(**_APPNG_PARSER_OPTIONS)
+
+# : Seconds to wait for all results of :func:`_pool_map`
+_POOL_MAP_TIMEOUT = 86400
+
+def _pool_map(func, items, workers):
+    '''Call func for every item with up to workers threads and return the results in order of items
+
+    The results are awaited with a timeout, an untimed wait of a thread pool
+    blocks KeyboardInterrupt on Python 2 until every task is done.
+
+    :param function func: Function which takes one item
+    :param list items: List of items
+    :param int workers: Maximum number of threads
+    :return: list
+    '''
+    pool = ThreadPool(min(workers, len(items)))
+    try:
+        results = pool.map_async(func, items).get(_POOL_MAP_TIMEOUT)
+    except BaseException:
+        # drop pending tasks, e.g. on KeyboardInterrupt, without waiting for
+        # running ones, the worker threads are daemons and end on their own
+        pool.terminate()
+        raise
+    pool.close()
+    pool.join()
+    return results
+
 # TODO: Examine why we still get BooleanValues instead of str.lower() when setting field value
 # TODO: Rework Grant/s Element
 
+class XMLElementType(type):
+    '''
+        Metaclass for :class:`XMLElement` and all inheriting classes
+
+        Derived class constants are precomputed once per class.
+    '''
+    def __init__(cls, name, bases, attrs):
+        super(XMLElementType, cls).__init__(name, bases, attrs)
+        cls._TYPE_LOWER = cls.TYPE.lower()
+        cls._TYPE_C_LOWER = cls.TYPE_C.lower()
+        cls._XML_TEMPLATE = None
+        cls._FIELD_KEYS = tuple(cls.FIELDS)
+        cls._ATTRIBUTE_KEYS = tuple(cls.ATTRIBUTES)
+        cls._CHILD_KEYS = tuple(cls.CHILDS)
+        cls._SUBELEMENT_KEYS = tuple(cls.SUBELEMENTS)
+        cls._NS_TAGS = dict((name, cls.NS_PREFIX+name) for name in
+                            cls._FIELD_KEYS + cls._ATTRIBUTE_KEYS +
+                            cls._CHILD_KEYS + cls._SUBELEMENT_KEYS)
+
 class XMLElement(object):
     '''
         Abstract class for an XML appNG entity
+
+        The classes of this module declare __slots__, subclasses which do not
+        declare their own still get a per-instance __dict__.
     '''
+    __metaclass__ = XMLElementType
+    __slots__ = ('xml', 'cdata_fields')
+
     # : Dictionary of XML namespaces
     XPATH_DEFAULT_NAMESPACE = {'a': 'http://www.appng.org/schema/appngizer'}
     # : Default namespace prefix as string
     NS_PREFIX = '{'+XPATH_DEFAULT_NAMESPACE['a']+'}'
+    # : Shared ElementMaker for elements in the default namespace
+    ELEMENT_MAKER = objectify.ElementMaker(annotate=False, namespace=XPATH_DEFAULT_NAMESPACE['a'])
+    # : Compiled XPath to find all elements with a namespace
+    XPATH_NS_ELEMENTS = etree.XPath("descendant-or-self::*[namespace-uri()!='']")
     # : Path to appNGizer XSD schema file as string
     XSD_APPNGIZER_PATH = (os.path.dirname(os.path.realpath(sys.modules[__name__].__file__))) + '/appngizer.xsd'
+    # : Validate XML against the appNGizer XSD schema before it is sent
+    VALIDATE_XML = True
+    # Compiled XSD schema, parsed on first validation
+    _XSD_SCHEMA = None
     # : Entity element name
     TYPE = 'Element'
     # : Entities element name
     TYPE_C = 'Elements'
     # : OrderedDict of entity fields which should be processed and initialised
     FIELDS = OrderedDict()
-    # List of FIELDS where value should be preserved if not given in 
-    PRESERVED_FIELDS = []
-    # List of FIELDS where value should be threatened as CDATA 
-    CDATA_FIELDS = []
+    # Set of FIELDS where value should be preserved if not given in 
+    PRESERVED_FIELDS = frozenset()
+    # Set of FIELDS where value should be threatened as CDATA 
+    CDATA_FIELDS = frozenset()
     # : OrderedDict of entity element attributes which should be processed and initialised
     ATTRIBUTES = OrderedDict()
     # : OrderedDict of entity child elements which should be processed and initialised
     CHILDS = OrderedDict()
     # : OrderedDict of entity sub elements which should be processed but not initialised
     SUBELEMENTS = OrderedDict()
+    # Dictionary of source types and the methods which set self.xml from them
+    _SET_XML_HANDLERS = {
+        BoolElement: '_set_xml_from_bool_element',
+        ObjectifiedElement: '_set_xml_from_xml_obj',
+        Response: '_set_xml_from_response',
+        dict: '_set_xml_from_dict',
+    }
     
     def __str__(self):
         '''Returns XML string representation of the object
@@ -67,34 +146,60 @@ class XMLElement(object):
            self.FIELDS are entity fields as SubElements
            self.ATTRIBUTES are entity attributes as ObjectElement Attributes
            self.CHILDS are child entities as SubElements
+
+           The template is built only once per class and copied afterwards.
            
         :return: lxml.objectify.ObjectifiedElement
         '''
-        Element = objectify.ElementMaker(annotate=False, 
-                                         namespace=self.XPATH_DEFAULT_NAMESPACE['a'])
-        xml_template = Element(self.__class__.__name__.lower())
+        cls = self.__class__
+        if cls._XML_TEMPLATE is None:
+            cls._XML_TEMPLATE = cls._build_xml_template()
+        xml_template = deepcopy(cls._XML_TEMPLATE)
+        # If attribute also exists as instance attribute we use value of it 
+        for attribute in self._ATTRIBUTE_KEYS:
+            if hasattr(self, attribute):
+                xml_template.set(attribute, self.__getattribute__(attribute))
+        return xml_template
+
+    @classmethod
+    def _build_xml_template(cls):
+        '''Build objectify.ObjectElement template from class constants
+
+        :return: lxml.objectify.ObjectifiedElement
+        '''
+        # Elements are created with their text directly, so no pytype annotation is involved
+        Element = cls.ELEMENT_MAKER
+        get_template_text = cls._get_template_text
         # SubElements
-        for field in self.FIELDS.keys():
-            ns_field = '{'+self.XPATH_DEFAULT_NAMESPACE['a']+'}'+field
-            objectify.SubElement(xml_template, ns_field, 
-                                 namespace=self.XPATH_DEFAULT_NAMESPACE['a'])
-            xml_template[field] = self.FIELDS[field]
+        xml_template = Element(cls.__name__.lower(), 
+                               *[Element(field, *get_template_text(cls.FIELDS[field])) 
+                                 for field in cls._FIELD_KEYS])
         # ObjectElement Attributes
-        for attribute in self.ATTRIBUTES.keys():
-            attribute_value = self.ATTRIBUTES.get(attribute, None)
+        for attribute in cls._ATTRIBUTE_KEYS:
+            attribute_value = cls.ATTRIBUTES.get(attribute, None)
             if type(attribute_value) == bool:
                 attribute_value = str(attribute_value).lower() 
             xml_template.set( attribute, attribute_value )
-            # If attribute also exists as class attribute we use value of it 
-            if hasattr(self, attribute):
-                xml_template.set(attribute, self.__getattribute__(attribute))
         # SubElements
-        for child in self.CHILDS.keys():
-            ns_field = '{'+self.XPATH_DEFAULT_NAMESPACE['a']+'}'+child
-            objectify.SubElement(xml_template, ns_field, 
-                                 namespace=self.XPATH_DEFAULT_NAMESPACE['a'])
-            xml_template[child] = self.CHILDS[child]
+        for child in cls._CHILD_KEYS:
+            xml_template.append(Element(child, *get_template_text(cls.CHILDS[child])))
         return xml_template
+
+    @staticmethod
+    def _get_template_text(value):
+        '''Return text of a template element for a default value of a class constant
+
+        The text is returned as tuple to be passed as ElementMaker children,
+        an empty tuple for None leaves the element empty.
+
+        :param * value: Default value, bool is rendered as lowercase string
+        :return: tuple
+        '''
+        if value is None:
+            return ()
+        if type(value) == bool:
+            return (str(value).lower(),)
+        return (str(value),)
     
     def _set_xml(self, source):
         '''Set self.xml by a given source
@@ -105,17 +210,28 @@ class XMLElement(object):
         :param lxml.objectify.BoolElement source(4): As BoolElement               
         :return: self
         '''
-        if type(source) == BoolElement:
-            self.xml = source
-        if type(source) == ObjectifiedElement:
-            self._set_xml_from_xml_obj(source)
-        if type(source) == Response:
-            xml_obj = objectify.fromstring(source.content)
-            self._set_xml_from_xml_obj(xml_obj)
-        if type(source) == dict:    
-            self._set_xml_from_dict(source)
+        handler = self._SET_XML_HANDLERS.get(type(source))
+        if handler is not None:
+            getattr(self, handler)(source)
         return self
 
+    def _set_xml_from_bool_element(self, bool_element):
+        '''Set self.xml directly to a given :class:`lxml.objectify.BoolElement`
+
+        :param lxml.objectify.BoolElement bool_element: Element of the entity
+        :return: None
+        '''
+        self.xml = bool_element
+
+    def _set_xml_from_response(self, response):
+        '''Parse :class:`requests.Response` content and set self.xml from it
+
+        :param requests.Response response: Response with the entity XML as content
+        :return: None
+        '''
+        xml_obj = objectify.fromstring(response.content, parser=_make_appng_parser())
+        self._set_xml_from_xml_obj(xml_obj)
+
     def _set_xml_from_dict(self, xdict):
         '''Process dictionary and call particular methods to set self.xml
                
@@ -132,19 +248,20 @@ class XMLElement(object):
         :return: None
         '''
         # Process fields
-        for field in self.FIELDS.iterkeys():
+        set_xml_field = self._set_xml_field
+        for field in self._FIELD_KEYS:
             if field in xdict:
-                self._set_xml_field(field, xdict[field])
+                set_xml_field(field, xdict[field])
         # Process attributes
-        for attribute in self.ATTRIBUTES.iterkeys():
+        for attribute in self._ATTRIBUTE_KEYS:
             if attribute in xdict:
                 self._set_xml_attribute(attribute, xdict[attribute])
         # Process childs
-        for child in self.CHILDS.iterkeys():
+        for child in self._CHILD_KEYS:
             if child in xdict:
                 self._set_xml_child(child, xdict[child])
         # Process elements
-        for subelement in self.SUBELEMENTS:
+        for subelement in self._SUBELEMENT_KEYS:
             if subelement in xdict:
                 self._set_xml_subelement(subelement, xdict[subelement])
     
@@ -166,19 +283,21 @@ class XMLElement(object):
         :return: None
         '''
         # Process fields
-        for field in self.FIELDS.iterkeys():
+        set_xml_field = self._set_xml_field
+        for field in self._FIELD_KEYS:
             if hasattr(xml_obj, field):
-                self._set_xml_field(field, xml_obj[field])
+                set_xml_field(field, xml_obj[field])
         # Process attributes
-        for attribute in self.ATTRIBUTES.iterkeys():
-            if attribute in xml_obj.attrib:
-                self._set_xml_attribute(attribute, xml_obj.attrib[attribute])
+        xml_attrib = xml_obj.attrib
+        for attribute in self._ATTRIBUTE_KEYS:
+            if attribute in xml_attrib:
+                self._set_xml_attribute(attribute, xml_attrib[attribute])
         # Process childs
-        for child in self.CHILDS.iterkeys():
+        for child in self._CHILD_KEYS:
             if hasattr(xml_obj, child):
                 self._set_xml_child(child, list(xml_obj[child]))
         # Process subelements
-        for subelement in self.SUBELEMENTS:
+        for subelement in self._SUBELEMENT_KEYS:
             if hasattr(xml_obj, subelement):
                 self._set_xml_subelement(subelement, list(xml_obj[subelement]))    
 
@@ -195,17 +314,14 @@ class XMLElement(object):
         :return: None
         '''
         # If field in PRESERVED_FIELDS an empty value will be not applied 
-        if value == None or value == '' or value == 'None':
+        if value in (None, '', 'None'):
             if field not in self.PRESERVED_FIELDS:
-                value = ''
-                self.xml.__setattr__(field, value)
-        else:
-            # If field in CDATA_FIELDS value is threatened as CDATA
-            if field in self.CDATA_FIELDS:
-                cdata_value = etree.CDATA(value)
-                self.xml.__setattr__(field, cdata_value)
-            else:
-                self.xml.__setattr__(field, value)
+                self.xml.__setattr__(field, '')
+            return
+        # If field in CDATA_FIELDS value is threatened as CDATA
+        if field in self.cdata_fields:
+            value = etree.CDATA(value)
+        self.xml.__setattr__(field, value)
 
     def _set_xml_attribute(self, attribute, value):
         '''Set self.xml element attributes
@@ -223,26 +339,18 @@ class XMLElement(object):
         
         The type of a child item in childs must be a :class:`lxml.objectify.ObjectifiedElement`.
 
+        The given elements are copied, so the source tree stays untouched.
+
         :param str child: Name of child container xml element
         :param list childs: list of child elements from type :class:`lxml.objectify.ObjectifiedElement` 
         :return: None
         '''
-        if len(childs) > 0:
-            child_tag = childs[0].tag
-            # handle the case we got an child element container instead of elements themself
-            if child_tag == self.NS_PREFIX+child:
-                container_childs = childs[0].getchildren()
-                if len(container_childs) > 0:
-                    child_tag = container_childs[0].tag
-                    self.xml[child].__setattr__(child_tag,container_childs)
-                else:
-                    self.xml.__delattr__(child)
-                    self.xml.__setattr__(child, None) 
-            else:
-                self.xml[child].__setattr__(child_tag,childs)
-        else:
-            self.xml.__delattr__(child)
-            self.xml.__setattr__(child, None) 
+        # handle the case we got an child element container instead of elements themself
+        if len(childs) > 0 and childs[0].tag == self._NS_TAGS[child]:
+            childs = list(childs[0].iterchildren())
+        container = self.xml.find(self._NS_TAGS[child])
+        container.clear()
+        container.extend([deepcopy(child_element) for child_element in childs])
 
     def _set_xml_subelement(self, subelement, subelements):
         '''Set self.xml subelements
@@ -256,15 +364,22 @@ class XMLElement(object):
     def get_xml_str(self, xml_obj=None):
         '''Copy, deannotate and return as a :class:`lxml.objectify.ObjectifiedElement` as string
         
+        self.xml is not copied but deannotated in place, it may have been
+        modified directly by the caller since the last call.
+
         :param lxml.objectify.ObjectifiedElement xml_obj: Element to return as string
         :return: string
         '''
         if xml_obj is None:
             xml_obj = self.xml
-        xml_deannot = deepcopy(xml_obj)
+        if xml_obj is self.xml:
+            xml_deannot = xml_obj
+        else:
+            xml_deannot = deepcopy(xml_obj)
         objectify.deannotate(xml_deannot, pytype=True, xsi=True, 
                              xsi_nil=True, cleanup_namespaces=True)
-        return etree.tostring(xml_deannot)
+        return etree.tostring(xml_deannot, encoding='UTF-8', xml_declaration=False, 
+                              pretty_print=False, with_tail=False)
     
     def convert_xml_obj_to_xml_element(self, xml_obj=None):
         '''Convert :class:`lxml.objectify.ObjectifiedElement` to :class:`lxml.etree.Element`
@@ -279,12 +394,15 @@ class XMLElement(object):
     def convert_xml_element_to_xml_obj(self, xml=None):
         '''Convert :class:`lxml.etree.Element` to :class:`lxml.objectify.ObjectifiedElement`
 
+        Without xml a copy of self.xml is returned, which needs only one
+        serialize and parse instead of a detour via :class:`lxml.etree.Element`.
+
         :param lxml.etree.Element xml: Element to convert
         :return: lxml.objectify.ObjectifiedElement
         '''
         if xml is None:
-            xml = self.convert_xml_obj_to_xml_element(self.xml)
-        return objectify.fromstring(etree.tostring(xml))
+            return objectify.fromstring(self.get_xml_str(self.xml), parser=_make_appng_parser())
+        return objectify.fromstring(etree.tostring(xml), parser=_make_appng_parser())
 
     def strip_ns_prefix(self, xml):
         '''Strip namespaces from :class:`lxml.etree.Element` and return it
@@ -292,52 +410,61 @@ class XMLElement(object):
         :param lxml.etree.Element xml: Element to strip
         :return: lxml.etree.Element
         '''
-        query = "descendant-or-self::*[namespace-uri()!='']"
-        elements = xml.xpath(query)
-        if elements is not None:
-            for element in xml.xpath(query):
-                element.tag = etree.QName(element).localname
-                etree.cleanup_namespaces(xml)
+        for element in self.XPATH_NS_ELEMENTS(xml):
+            element.tag = element.tag.rpartition('}')[2]
+        etree.cleanup_namespaces(xml)
         return xml
 
-    def dump(self, xml=None):
+    def dump(self, xml=None, pretty_print=True):
         '''Pretty print an :class:`lxml.etree.Element` or :class:`lxml.objectify.ObjectifiedElement` as string
         
         :param lxml.etree.Element xml(1): Element to pretty print
         :param lxml.objectify.ObjectifiedElement xml(2): Element to pretty print
+        :param bool pretty_print: Indent output, set False for a compact single line
         :return: string
         '''
         if xml is None:
             xml = self.xml
         
-        copy = deepcopy(xml)
-        if type(copy) == ObjectifiedElement:
-            copy = self.convert_xml_obj_to_xml_element(copy)
+        # Conversion already returns a new element, so only copy otherwise
+        if type(xml) == ObjectifiedElement:
+            copy = self.convert_xml_obj_to_xml_element(xml)
+        else:
+            copy = deepcopy(xml)
         copy = self.strip_ns_prefix(copy)
         
         return etree.tostring(copy, encoding='UTF-8', xml_declaration=True, 
-                              pretty_print=True)
+                              pretty_print=pretty_print)
+
+    @classmethod
+    def _get_xsd_schema(cls):
+        '''Return the compiled appNGizer XSD schema, which is parsed only once
+
+        :return: lxml.etree.XMLSchema
+        '''
+        if XMLElement._XSD_SCHEMA is None:
+            with open(cls.XSD_APPNGIZER_PATH, 'rb') as xsd_file:
+                XMLElement._XSD_SCHEMA = etree.XMLSchema(etree.parse(xsd_file))
+        return XMLElement._XSD_SCHEMA
 
     def is_valide_xml(self, xml=None):
         '''Validate :class:`lxml.etree.Element` against the appNGizer xsd schema
 
+        Validation is skipped if self.VALIDATE_XML is False.
+
         :param lxml.etree.Element xml: Element to be validated, if not self.xml is used
         :return: bool (True if valide)
         '''
-        doc = file(self.XSD_APPNGIZER_PATH, 'r')
-        xsd_schema_doc = etree.parse(doc)
-        xsd_schema = etree.XMLSchema(xsd_schema_doc)
+        if not self.VALIDATE_XML:
+            return True
+        xsd_schema = self._get_xsd_schema()
         if xml is None:
             xml = self.convert_xml_obj_to_xml_element()
 
-        try:
-            xsd_schema.assertValid(xml)
-            is_valide_xml = True
-        except etree.DocumentInvalid as e:
-            logging.warn(e)
-            is_valide_xml = False
-        except:
-            raise
+        is_valide_xml = xsd_schema.validate(xml)
+        if not is_valide_xml:
+            error = xsd_schema.error_log[0]
+            logging.warn('{}, line {}'.format(error.message, error.line))
         return is_valide_xml
 
 
@@ -346,17 +473,24 @@ class Element(XMLElement):
     '''
         Abstract class of an appNG entity
     '''
-    def __init__(self, name='', parents=[]):
+    __slots__ = ('name', 'parents', 'url', 'loaded', 'loaded_at', 'modified')
+
+    # : Seconds a load of the entity is trusted by :meth:`exist`
+    EXIST_CACHE_TTL = 1
+
+    def __init__(self, name='', parents=None):
         '''
         :param str name: Name of entity
         :param list parents: List of :class:`Element` objects which are parents of the entity
         '''
         self.name = name
-        self.parents = parents
+        self.parents = [] if parents is None else parents
         self.url = self.get_url_dict()
         self.xml = self._get_xml_template()
         self.loaded = False
+        self.loaded_at = 0
         self.modified = False
+        self.cdata_fields = self.CDATA_FIELDS
 
     def get_url_dict(self):
         '''Return dictionary with url path components of the entity
@@ -368,20 +502,21 @@ class Element(XMLElement):
         :return: dict
         '''
         return self._get_url_dict()
-    def _get_url_dict(self):
-        url = {'self': '', 'ancestor': '', 'parents': '', 'type': self.TYPE.lower()}
+    def _get_url_dict(self, url_type=None):
+        url = {'self': '', 'ancestor': '', 'parents': '', 'type': url_type or self._TYPE_LOWER}
 
         # url['parents']
-        if hasattr(self, 'parents'):
-            for parent in self.parents:
-                url['parents'] = ''.join([ url['parents'], parent.url['self'] ])
+        # parents are given as flat list of unnested entities, e.g. [Site('s'), Application('a')],
+        # so the url of the last parent does not contain the others and all have to be joined
+        if self.parents:
+            url['parents'] = ''.join([parent.url['self'] for parent in self.parents])
         # url['ancestor']
-        url['ancestor'] = '/'.join([url['parents'], url['type']])
+        url['ancestor'] = url['parents'] + '/' + url['type']
         # url['self']
         if self.name == None:
             url['self'] = url['ancestor']
         else:
-            url['self'] = '/'.join([url['ancestor'], self.name])
+            url['self'] = url['ancestor'] + '/' + self.name
         return url
 
     def load(self):
@@ -398,6 +533,7 @@ class Element(XMLElement):
         request = XMLClient().request('GET', self.url['self'])
         self._set_xml(request.response)
         self.loaded = True
+        self.loaded_at = time.time()
         self.modified = False
 
     def load_if_needed(self):
@@ -430,7 +566,7 @@ class Element(XMLElement):
             self.modified = True
             return self.convert_xml_obj_to_xml_element()
         else:
-            raise appngizer.errors.ElementError("Current XML for {0}({1}) does not validate: {2}".format(self.__class__.__name__, self.name, self.dump()))
+            raise appngizer.errors.ElementError("Current XML for {0}({1}) does not validate: {2}".format(self.__class__.__name__, self.name, self.dump(pretty_print=False)))
 
     def read(self):
         '''Read entity and return as lxml.etree.Element
@@ -453,12 +589,12 @@ class Element(XMLElement):
             log.debug("Update {}({})".format(self.__class__.__name__, self.name))
         self.load_if_needed()
         self._set_xml(xdict)
-        if self.is_valide_xml( self.convert_xml_obj_to_xml_element() ):
+        if self.is_valide_xml():
             request = XMLClient().request('PUT', self.url['self'], self.get_xml_str())
             self._set_xml(request.response)
             return self.convert_xml_obj_to_xml_element()
         else:
-            raise appngizer.errors.ElementError("Current XML for {}({}) does not validate: {}".format(self.__class__.__name__, self.name, self.dump()))
+            raise appngizer.errors.ElementError("Current XML for {}({}) does not validate: {}".format(self.__class__.__name__, self.name, self.dump(pretty_print=False)))
 
     def delete(self):
         '''Delete entity
@@ -474,6 +610,7 @@ class Element(XMLElement):
     def _delete(self):
         if self.exist():
             XMLClient().request('DELETE', self.url['self'])
+            self.loaded = False
             self.modified = False
             return True
         else:
@@ -482,16 +619,53 @@ class Element(XMLElement):
     def exist(self):
         '''Check if entity already exist
 
+        An entity which was loaded less than self.EXIST_CACHE_TTL seconds ago
+        and not modified since is known to exist, so no further request is
+        done in that case.
+
         :return: bool (True if exist)
         '''
         return self._exist()
     def _exist(self):
+        if self.loaded and not self.modified and time.time() - self.loaded_at < self.EXIST_CACHE_TTL:
+            return True
         try:
             self.load()
             return True
-        except:
+        except (appngizer.errors.HttpElementNotFound, appngizer.errors.ElementNotFound):
+            self.loaded = False
             return False
         
+    def _get_updated_xml(self, xdict):
+        '''Return a copy of self.xml with xdict applied, self.xml stays untouched
+
+        Only the XML tree is copied instead of the whole entity with its parents.
+
+        :param dict xdict: Dictionary of fields and attributes to be set
+        :return: lxml.objectify.ObjectifiedElement
+        '''
+        current_xml = self.xml
+        self.xml = deepcopy(current_xml)
+        try:
+            self._set_xml(xdict)
+            return self.xml
+        finally:
+            self.xml = current_xml
+
+    def _log_update_needed(self, result):
+        '''Log result of an update check, the message is only built if debug logging is enabled
+
+        :param bool result: Update is needed
+        :return: None
+        '''
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+        if self.parents:
+            parent_types = ' '.join([p.TYPE for p in self.parents])
+            log.debug("Update needed for %s %s(%s) is %s", parent_types, self.__class__.__name__, self.name, result)
+        else:
+            log.debug("Update needed for %s(%s) is %s", self.__class__.__name__, self.name, result)
+
     def _is_update_needed(self, xdict):
         '''Check if update of entity is needed
         
@@ -501,20 +675,19 @@ class Element(XMLElement):
         self.load_if_needed()
         
         result = False
-        new_obj = deepcopy(self)
-        new_obj._set_xml(xdict)
+        current_xml = self.xml
+        new_xml = self._get_updated_xml(xdict)
         
-        for field in self.FIELDS.iterkeys():
-            if self.xml[field].text != new_obj.xml[field].text:
+        # Direct objectify child lookups are cheaper here than one compiled
+        # XPath over all fields, entity trees are too small to benefit from it
+        for field in self._FIELD_KEYS:
+            if current_xml[field].text != new_xml[field].text:
                 result = True
+                break
 
-        if len(self.parents) > 0:
-            parent_types = ' '.join( [p.TYPE for p in self.parents] )
-            log.debug("Update needed for {} {}({}) is {}".format(parent_types, self.__class__.__name__, self.name, str(result)))
-        else:
-            log.debug("Update needed for {}({}) is {}".format(self.__class__.__name__, self.name, str(result)))
+        self._log_update_needed(result)
 
-        return result, self.xml, new_obj.xml
+        return result, current_xml, new_xml
 
 
 
@@ -531,11 +704,13 @@ class Site(Element):
     ATTRIBUTES = OrderedDict()
     ATTRIBUTES['name'] = ''
     
-    PRESERVED_FIELDS = ['description','domain']
+    PRESERVED_FIELDS = frozenset(['description','domain'])
 
     TYPE = 'Site'
     TYPE_C = 'Sites'
 
+    __slots__ = ()
+
     def create(self, **xdict):
         '''Create site
 
@@ -577,10 +752,7 @@ class Site(Element):
 
         :return: bool (True if reloaded)
         '''
-        if XMLClient().request('PUT', self.url['self'] + '/reload'):
-            return True
-        else:
-            return False
+        return bool(XMLClient().request('PUT', self.url['self'] + '/reload'))
 
 
 
@@ -600,11 +772,57 @@ class Repository(Element):
     FIELDS['packages'] = None
     ATTRIBUTES = {'name': ''}
     
-    PRESERVED_FIELDS = ['description']
+    PRESERVED_FIELDS = frozenset(['description'])
     
     TYPE = 'Repository'
     TYPE_C = 'Repositories'
 
+    __slots__ = ('pkg_cache', 'pkg_cache_generation')
+
+    # : Seconds a result of :meth:`list_pkg` is reused for the same package
+    PKG_CACHE_TTL = 5
+    # Bumped by clear_pkg_caches() to invalidate pkg_cache of all instances
+    _PKG_CACHE_GENERATION = 0
+
+    def __init__(self, name='', parents=None):
+        '''
+        :param str name: Name of repository
+        :param list parents: List of :class:`Element` objects which are parents of the entity
+        '''
+        super(Repository, self).__init__(name, parents)
+        # : Package name to (timestamp, result) of :meth:`list_pkg`
+        self.pkg_cache = {}
+        self.pkg_cache_generation = Repository._PKG_CACHE_GENERATION
+
+    def _load(self):
+        super(Repository, self)._load()
+        self.pkg_cache = {}
+
+    def _create(self, xdict):
+        result = super(Repository, self)._create(xdict)
+        Packages.clear_find_cache()
+        return result
+
+    def _update(self, xdict):
+        result = super(Repository, self)._update(xdict)
+        Packages.clear_find_cache()
+        return result
+
+    def _delete(self):
+        result = super(Repository, self)._delete()
+        Packages.clear_find_cache()
+        return result
+
+    @classmethod
+    def clear_pkg_caches(cls):
+        '''Invalidate the cached :meth:`list_pkg` results of all repositories
+
+        Has to be called whenever a repository or the installed state of a package changes.
+
+        :return: None
+        '''
+        Repository._PKG_CACHE_GENERATION += 1
+
     def create(self, **xdict):
         '''Create repository
 
@@ -657,31 +875,36 @@ class Repository(Element):
         :return: bool (True if has package)
         '''
         pkg_name = xdict['name']
-        has_pkg = False
-        try:
-            pkg_url = '/'.join([ self.url['self'],pkg_name ])
-            request = XMLClient().request('GET', pkg_url)
-            has_pkg = True
-        except:
-            has_pkg = False
+        has_pkg = self.list_pkg(name=pkg_name) is not None
         log.debug("Package({}) in Repository({}) available is {}".format(pkg_name, self.name, str(has_pkg)))
         return has_pkg
     
     def list_pkg(self, **xdict):
         '''Get a list of all variants of a package in the repository
         
+        The result is cached per package name for self.PKG_CACHE_TTL seconds, until
+        the repository is loaded again or :meth:`clear_pkg_caches` is called, so
+        :meth:`has_pkg` followed by :meth:`list_pkg` does only one request.
+
         :param str xdict['name']*: name of package
         :return: lxml.objectify.ObjectifiedElement
         '''
         pkg_name = xdict['name']
+        if self.pkg_cache_generation != Repository._PKG_CACHE_GENERATION:
+            self.pkg_cache = {}
+            self.pkg_cache_generation = Repository._PKG_CACHE_GENERATION
+        cached = self.pkg_cache.get(pkg_name)
+        if cached is not None and time.time() - cached[0] < self.PKG_CACHE_TTL:
+            return cached[1]
         log.debug("Read Package({})".format(pkg_name))
-        pkg_url = '/'.join([ self.url['self'],pkg_name ])
+        pkg_url = self.url['self'] + '/' + pkg_name
         try:
             request = XMLClient().request('GET', pkg_url)
-        # APPNG-2071 we should catch only if HTTP 404
-        except:
-            return None
-        return objectify.fromstring(request.response.content)
+            pkg_list = objectify.fromstring(request.response.content, parser=_make_appng_parser())
+        except appngizer.errors.HttpElementNotFound:
+            pkg_list = None
+        self.pkg_cache[pkg_name] = (time.time(), pkg_list)
+        return pkg_list
     
     def list_pkgs(self):
         '''Get a list of all packages in the repository 
@@ -704,11 +927,15 @@ class Property(Element):
     FIELDS['description'] = ''
     ATTRIBUTES = {'name': '', 'clob': False}
     
-    PRESERVED_FIELDS = ['description', 'defaultValue']
+    PRESERVED_FIELDS = frozenset(['description', 'defaultValue'])
+    # : Set of FIELDS which are threatened as CDATA if clob is requested
+    CLOB_FIELDS = frozenset(['value', 'defaultValue'])
     
     TYPE = 'Property'
     TYPE_C = 'Properties'
 
+    __slots__ = ()
+
     def create(self, **xdict):
         '''Create property
 
@@ -719,7 +946,7 @@ class Property(Element):
         :return: lxml.etree.Element
         '''
         if xdict.get('clob', False):
-            self.CDATA_FIELDS = ['value', 'defaultValue']
+            self.cdata_fields = self.CLOB_FIELDS
         return self._create(xdict)
 
     def update(self, **xdict):
@@ -732,7 +959,7 @@ class Property(Element):
         :return: lxml.etree.Element
         '''
         if xdict.get('clob', False):
-            self.CDATA_FIELDS = ['value', 'defaultValue']
+            self.cdata_fields = self.CLOB_FIELDS
         return self._update(xdict)
 
     def is_update_needed(self, **xdict):
@@ -745,7 +972,7 @@ class Property(Element):
         :return: bool (True if needed), lxml.etree.Element (current), lxml.etree.Element (updated)
         '''
         if xdict.get('clob', False):
-            self.CDATA_FIELDS = ['value', 'defaultValue']
+            self.cdata_fields = self.CLOB_FIELDS
         return self._is_update_needed(xdict)
 
 
@@ -766,6 +993,11 @@ class Application(Element):
     TYPE = 'Application'
     TYPE_C = 'Applications'
 
+    __slots__ = ()
+
+    # : Number of threads used to check the assignment to all sites
+    SITE_SCAN_WORKERS = 8
+
     def update(self, **xdict):
         '''Update application settings
 
@@ -795,21 +1027,35 @@ class Application(Element):
             
         :return: bool (True if deleted)
         '''
+        sites_assigned = [site.name for site in self._get_assigned_sites()]
+        if len(sites_assigned) > 0:
+            raise appngizer.errors.ElementError("Delete {0}({1}) aborted, deassign from site/s({2}) first".format(self.__class__.__name__, self.name, ', '.join(sites_assigned)))
+        XMLClient().request('DELETE', self.url['self'])
+        # installed flag of the package has changed
+        Packages.clear_find_cache()
+        self.loaded = False
+        self.modified = False
+        return True
+
+    def _get_assigned_sites(self):
+        '''Return all sites the application is assigned to
+
+        The assignment is checked for all sites concurrently with up to
+        self.SITE_SCAN_WORKERS threads. appNGizer has no resource listing
+        the sites of an application, :class:`Grants` of a site application
+        only tell which other sites may access it.
+
+        :return: list of :class:`Site`
+        '''
         sites = Sites()
-        sites_assigned = []
-        is_assigned = False
-        for site in sites.site:
-            site_obj = Site(site.name)._set_xml(self.convert_xml_obj_to_xml_element(site))
-            site_app = Application(self.name)
-            
-            if site_app.is_assigned( site=site_obj ):
-                is_assigned = True
-                sites_assigned.append(site.name)
-            if is_assigned:
-                raise appngizer.errors.ElementError("Delete {0}({1}) aborted, deassign from site/s({2}) first".format(self.__class__.__name__, self.name, ', '.join(sites_assigned)))
-            XMLClient().request('DELETE', self.url['self'])
-            self.modified = False
-            return True
+        sites.load()
+        site_objs = [Site(site.get('name')) for site in sites.xml.iterchildren(Sites._NS_TAGS['site'])]
+        if len(site_objs) == 0:
+            return []
+        
+        is_assigned = _pool_map(lambda site_obj: Application(self.name).is_assigned(site_obj),
+                                site_objs, self.SITE_SCAN_WORKERS)
+        return [site_obj for site_obj, assigned in zip(site_objs, is_assigned) if assigned]
 
     def is_assigned(self, site):
         '''Check if application is assigned to a site
@@ -817,7 +1063,7 @@ class Application(Element):
         :return: bool (True if is assigned)
         '''
         is_assigned = False
-        if type(site) != Site:
+        if not isinstance(site, Site):
             raise appngizer.errors.ElementError("Can't check if {0}({1}) is assigned to a site because site is not a Site object".format(self.__class__.__name__, self.name))
 
         try:
@@ -827,8 +1073,6 @@ class Application(Element):
             is_assigned = True
         except appngizer.errors.HttpElementNotFound:
             pass
-        except:
-            raise
         log.debug("{0}({1}) assigned on site {2} is {3}".format(self.__class__.__name__, self.name, site.name, is_assigned))
         return is_assigned
 
@@ -837,7 +1081,7 @@ class Application(Element):
 
         :return: bool (True if assigned)
         '''
-        if type(site) != Site:
+        if not isinstance(site, Site):
             raise appngizer.errors.ElementError("Can't assign {0}({1}) to site because site is not a Site object".format(self.__class__.__name__, self.name))
 
         self.load_if_needed()
@@ -854,7 +1098,7 @@ class Application(Element):
 
         :return: bool (True if deassigned)
         '''
-        if type(site) != Site:
+        if not isinstance(site, Site):
             raise appngizer.errors.ElementError("Can't deassign {0}({1}) from a site because site is not a Site object".format(self.__class__.__name__, self.name))
 
         log.debug('Deassign {0}({1}) to site {2}'.format(self.__class__.__name__,self.name, site.name))
@@ -870,15 +1114,8 @@ class Application(Element):
 
         :return: bool (True if deassigned)
         '''
-        sites = Sites()
-        sites.load()
-        for site in sites.xml.site:
-            site_obj = Site(site.get('name'))
-            site_obj._set_xml(site)
-            site_app = Application(self.name, parents=[site_obj])
-            
-            if site_app.is_assigned(site_obj):
-                site_app.deassign(site_obj)
+        for site_obj in self._get_assigned_sites():
+            self.deassign(site_obj)
         return True
         
 
@@ -897,19 +1134,34 @@ class Package(Element):
     
     TYPE = 'Package'
     TYPE_C = 'Packages'
+
+    __slots__ = ()
+
+    # : Tuple of fields which can be used to filter for specific packages
+    FILTER_FIELDS = ('version', 'timestamp')
     
-    def __init__(self, name=None, parents=[]):
+    def __init__(self, name=None, parents=None):
         '''Initialising of package object
         
         :param str name: Name of entity
         :param list parents: List of :class:`Element` objects which are parents of the current entity
         '''
         self.name = name
-        self.parents = parents
+        self.parents = [] if parents is None else parents
         self.xml = self._get_xml_template()
         self.loaded = False
+        self.loaded_at = 0
         self.modified = False
+        self.cdata_fields = self.CDATA_FIELDS
         
+    def _get_filter(self, xdict):
+        '''Return filter dictionary for :meth:`Packages.find` from given xdict
+
+        :param dict xdict: Dictionary which may contain items of self.FILTER_FIELDS
+        :return: dict
+        '''
+        return {field: xdict[field] for field in self.FILTER_FIELDS if field in xdict}
+
     def exist(self, **xdict):
         '''Check if a package exist
         
@@ -917,11 +1169,7 @@ class Package(Element):
         :param str xdict['timestamp']: Filter for a specific timestamp
         :return: bool (True if exist)
         '''
-        filter = {}
-        if 'version' in xdict:
-            filter['version'] = xdict['version']
-        if 'timestamp' in xdict:
-            filter['timestamp'] = xdict['timestamp']  
+        filter = self._get_filter(xdict)
         
         find_pkg = Packages(parents=self.parents).find(name=self.name, filter=filter)
         
@@ -931,6 +1179,17 @@ class Package(Element):
             package_exist = False
         return package_exist
     
+    def _pick_package(self, find_pkgs, allow_snapshot):
+        '''Return newest package of a :meth:`Packages.find` result
+
+        :param lxml.objectify.ObjectifiedElement find_pkgs: Packages sorted newest first
+        :param bool allow_snapshot: Allow snapshot packages
+        :return: lxml.objectify.ObjectifiedElement or None if only snapshots are available
+        '''
+        if allow_snapshot:
+            return find_pkgs.package[0]
+        return next((pkg for pkg in find_pkgs.package if '-SNAPSHOT' not in pkg.version.text), None)
+
     def is_installed(self, **xdict):
         '''Check if a package is already installed
 
@@ -960,37 +1219,28 @@ class Package(Element):
         :return: bool (True if needed), lxml.etree.Element (current), lxml.etree.Element (updated)
         '''
         is_update_needed = False
-        filter = {}
-        if 'version' in xdict:
-            filter['version'] = xdict['version']
-        if 'timestamp' in xdict:
-            filter['timestamp'] = xdict['timestamp']
+        filter = self._get_filter(xdict)
         allow_snapshot = xdict.get('allow_snapshot', False)
-        find_pkg = None
         
-        self.read()
+        current_xml = self.read()
 
         find_pkgs = Packages(parents=self.parents).find(name=self.name, filter=filter)
         if not hasattr(find_pkgs, 'package'):
             raise appngizer.errors.ElementNotFound('Package {} is not available with {}'.format(self.name, filter))
-        if not allow_snapshot:
-            for pkg in find_pkgs.package:
-                if '-SNAPSHOT' not in pkg.version.text:
-                    find_pkg = pkg
-                    break
-        else:
-            find_pkg = find_pkgs.package[0]
+        find_pkg = self._pick_package(find_pkgs, allow_snapshot)
         if find_pkg is None:
             raise appngizer.errors.ElementNotFound('Package {} is not available with {}'.format(self.name, filter))
 
-        if self.xml.version != find_pkg.version:
-            if LooseVersion(self.xml.version.text) < LooseVersion(find_pkg.version.text):
+        version = self.xml.version.text
+        find_version = find_pkg.version.text
+        if version != find_version:
+            if LooseVersion(version) < LooseVersion(find_version):
                 is_update_needed = True        
-        elif self.xml.timestamp != find_pkg.timestamp:
+        elif self.xml.timestamp.text != find_pkg.timestamp.text:
             is_update_needed = True
 
         delattr(find_pkg, 'repository')
-        return is_update_needed, self.convert_xml_obj_to_xml_element(self.xml), self.convert_xml_obj_to_xml_element(find_pkg)
+        return is_update_needed, current_xml, self.convert_xml_obj_to_xml_element(find_pkg)
 
     def load(self):
         '''Load package data from Packages object
@@ -1010,6 +1260,7 @@ class Package(Element):
             else:
                 raise appngizer.errors.ElementNotFound('Package {} is not installed'.format(self.name))
         self.loaded = True
+        self.loaded_at = time.time()
 
     def install(self, **xdict):
         '''Install a package
@@ -1019,26 +1270,15 @@ class Package(Element):
         :param bool xdict['allow_snapshot']: Allow snapshot packages if no specific version is given         
         :return: lxml.etree.Element
         '''
-        filter = {}
-        if 'version' in xdict:
-            filter['version'] = xdict['version']
-        if 'timestamp' in xdict:
-            filter['timestamp'] = xdict['timestamp']
+        filter = self._get_filter(xdict)
         allow_snapshot = xdict.get('allow_snapshot', False)
-        find_pkg = None
         
         self._set_xml(xdict)
         
         find_pkgs = Packages(parents=self.parents).find(name=self.name, filter={})
         if not hasattr(find_pkgs, 'package'):
             raise appngizer.errors.ElementNotFound('Package {} is not available with {}'.format(self.name, filter))
-        if not allow_snapshot:
-            for pkg in find_pkgs.package:
-                if '-SNAPSHOT' not in pkg.version.text:
-                    find_pkg = pkg
-                    break
-        else:
-            find_pkg = find_pkgs.package[0]
+        find_pkg = self._pick_package(find_pkgs, allow_snapshot)
         if find_pkg is None:
             raise appngizer.errors.ElementNotFound('Package {} is not available with {}'.format(self.name, filter))
         
@@ -1050,13 +1290,15 @@ class Package(Element):
     def _install(self, repository):
         self.xml.installed = True
         if self.is_valide_xml():
-            install_url = '/'.join([ '/repository',repository.get('name'),'install' ])
+            install_url = '/repository/' + repository.get('name') + '/install'
             request = XMLClient().request('PUT', install_url, self.get_xml_str())
+            # installed flag of found packages has changed
+            Packages.clear_find_cache()
             self._set_xml(request.response)
             self.modified = True
             return self.convert_xml_obj_to_xml_element()
         else:
-            raise appngizer.errors.ElementError("Current XML for {0}({1}) does not validate: {2}".format(self.__class__.__name__, self.name, self.dump()))
+            raise appngizer.errors.ElementError("Current XML for {0}({1}) does not validate: {2}".format(self.__class__.__name__, self.name, self.dump(pretty_print=False)))
     def update(self, **xdict):
         '''update() is an alias for install()
         '''
@@ -1087,11 +1329,13 @@ class Subject(Element):
     CHILDS['groups'] = None
     ATTRIBUTES = {'name': ''}
     
-    PRESERVED_FIELDS = ['description','email','timeZone','language','type']
+    PRESERVED_FIELDS = frozenset(['description','email','timeZone','language','type'])
     
     TYPE = 'Subject'
     TYPE_C = 'Subjects'
 
+    __slots__ = ()
+
     def digest_match_hash(self, digest, hashed):
         '''Check if digest match hash
         
@@ -1102,16 +1346,28 @@ class Subject(Element):
         :param str hashed: bcrypt hash of digest to match
         :return: bool (True if match)
         '''
-        if str(digest).startswith('$2a$'):
-            if str(digest) == str(hashed):
-                return True
-            else:
-                return False
-        else:
-            if bcrypt.hashpw(str(digest), str(hashed)) == str(hashed):
-                return True
-            else:
-                return False
+        digest = self._get_digest_bytes(digest)
+        hashed = self._get_digest_bytes(hashed)
+        if digest.startswith(b'$2a$'):
+            return digest == hashed
+        # no bcrypt hash to match against, e.g. for a subject without digest
+        if not hashed.startswith(b'$2'):
+            return False
+        # bcrypt is a native extension, import it only when a hash is needed
+        import bcrypt
+        return bcrypt.hashpw(digest, hashed) == hashed
+
+    def _get_digest_bytes(self, digest):
+        '''Return digest as bytes like bcrypt expects it
+
+        :param * digest: digest as str, unicode or lxml.objectify.ObjectifiedElement
+        :return: bytes
+        '''
+        if isinstance(digest, etree._Element):
+            digest = digest.text or ''
+        if not isinstance(digest, bytes):
+            digest = digest.encode('utf-8')
+        return digest
 
     def create(self, **xdict):
         '''Create subject
@@ -1130,6 +1386,10 @@ class Subject(Element):
     def update(self, **xdict):
         '''Update subject
 
+        If the digest matches the current hash, no other field changes and
+        neither groups nor attributes are given, no request is sent and the
+        current subject is returned.
+
         :param str xdict['realName']: Real name of subject 
         :param str xdict['email']: E-Mail address of subject 
         :param str xdict['description']: Short description of subject
@@ -1140,10 +1400,15 @@ class Subject(Element):
         :return: lxml.etree.Element
         '''
         if 'digest' in xdict:
+            self.load_if_needed()
             old_digest = self.xml.digest
             new_digest = xdict['digest']
             if self.digest_match_hash(new_digest, old_digest):
                 xdict['digest'] = old_digest
+                # _is_update_needed() only compares fields
+                only_fields = not any(key in xdict for key in self._CHILD_KEYS + self._ATTRIBUTE_KEYS)
+                if only_fields and not self._is_update_needed(xdict)[0]:
+                    return self.convert_xml_obj_to_xml_element()
         return self._update(xdict)
 
     def is_update_needed(self, **xdict):
@@ -1159,7 +1424,7 @@ class Subject(Element):
         :return: bool (True if needed), lxml.etree.Element (current), lxml.etree.Element (updated)
         '''
         if 'digest' in xdict:
-            self.read()
+            self.load_if_needed()
             old_digest = self.xml.digest
             new_digest = xdict['digest']
             if self.digest_match_hash(new_digest, old_digest):
@@ -1178,11 +1443,13 @@ class Group(Element):
     CHILDS['roles'] = None
     ATTRIBUTES = {'name': ''}
     
-    PRESERVED_FIELDS = ['description']
+    PRESERVED_FIELDS = frozenset(['description'])
 
     TYPE = 'Group'
     TYPE_C = 'Groups'
 
+    __slots__ = ()
+
     def create(self, **xdict):
         '''Create group
 
@@ -1223,26 +1490,30 @@ class Role(Element):
     CHILDS['permissions'] = None
     ATTRIBUTES = {'name': ''}
     
-    PRESERVED_FIELDS = ['description']
+    PRESERVED_FIELDS = frozenset(['description'])
 
     TYPE = 'Role'
     TYPE_C = 'Roles'
+
+    __slots__ = ()
     
-    def __init__(self, name=None, parents=[]):
+    def __init__(self, name=None, parents=None):
         '''
         :param str name: Name of entity
         :param list parents: List of :class:`Element` objects which are parents of the current entity
         '''
         self.name = name
-        self.parents = parents
+        self.parents = [] if parents is None else parents
         self.url = self.get_url_dict()
         self.xml = self._get_xml_template_role()
         self.loaded = False
+        self.loaded_at = 0
         self.modified = False
+        self.cdata_fields = self.CDATA_FIELDS
     
     def _get_xml_template_role(self):
         xml_template = self._get_xml_template()
-        xml_template.application = self.parents[0].name
+        xml_template.application._setText(self.parents[0].name)
         return xml_template
 
     def create(self, **xdict):
@@ -1283,26 +1554,30 @@ class Permission(Element):
     FIELDS['description'] = ''
     ATTRIBUTES = {'name': ''}
     
-    PRESERVED_FIELDS = ['description']
+    PRESERVED_FIELDS = frozenset(['description'])
 
     TYPE = 'Permission'
     TYPE_C = 'Permissions'
+
+    __slots__ = ()
     
-    def __init__(self, name=None, parents=[]):
+    def __init__(self, name=None, parents=None):
         '''
         :param str name: Name of entity
         :param list parents: List of :class:`Element` objects which are parents of the current entity
         '''
         self.name = name
-        self.parents = parents
+        self.parents = [] if parents is None else parents
         self.url = self._get_url_dict()
         self.xml = self._get_xml_template_permission()
         self.loaded = False
+        self.loaded_at = 0
         self.modified = False
+        self.cdata_fields = self.CDATA_FIELDS
     
     def _get_xml_template_permission(self):
         xml_template = self._get_xml_template()
-        xml_template.application = self.parents[0].name
+        xml_template.application._setText(self.parents[0].name)
         return xml_template
 
     def create(self, **xdict):
@@ -1339,15 +1614,14 @@ class Platform(Element):
     TYPE = 'Platform'
     TYPE_C = 'Platform'
 
+    __slots__ = ()
+
     def reload(self):
         '''Reload Platform
 
         :return: bool (True if reloaded)
         '''
-        if XMLClient().request('POST', self.url['self'] + '/reload'):
-            return True
-        else:
-            return False
+        return bool(XMLClient().request('POST', self.url['self'] + '/reload'))
 
     def delete(self):
         '''
@@ -1364,10 +1638,11 @@ class Grant(Element):
     
     TYPE = 'Grant'
     TYPE_C = 'Grant'
+
+    __slots__ = ()
     
     def _get_xml_template(self):
-        Element = objectify.ElementMaker(annotate=False, namespace=self.XPATH_DEFAULT_NAMESPACE['a'])
-        xml_template = Element.grant(
+        xml_template = self.ELEMENT_MAKER.grant(
             site=self.name
         )
         return xml_template
@@ -1381,6 +1656,7 @@ class Grant(Element):
         if grant is not None:
             self._set_xml(grant)
             self.loaded = True
+            self.loaded_at = time.time()
         else:
             raise appngizer.errors.ElementNotFound('Grant {} is not available'.format(self.name))
     
@@ -1398,6 +1674,8 @@ class Database(Element):
     '''
     TYPE = 'Database'
     TYPE_C = 'Databases'
+
+    __slots__ = ()
     FIELDS = OrderedDict()
     FIELDS['type'] = ''
     FIELDS['user'] = ''
@@ -1409,17 +1687,26 @@ class Database(Element):
     CHILDS = OrderedDict()
     ATTRIBUTES = {'id': ''}
     
+    # Platform sharedsecret by appNGizer base url
+    _SHAREDSECRETS = {}
+    # bcrypt salt by plaintext salt
+    _BCRYPT_SALTS = {}
+    
     def _get_sharedsecret(self,xdict):
         '''Get the sharedsecret from platform properties
+
+        The platform sharedsecret is loaded only once per appNGizer instance.
+
         :return: string
         '''
         if 'salt' in xdict:
-            sharedseceret = xdict['salt']
-        else:
+            return xdict['salt']
+        base_url = XMLClient().base_url
+        if base_url not in Database._SHAREDSECRETS:
             p_sharedsecret = Property('sharedSecret', parents=[ Platform() ])
             p_sharedsecret.load()
-            sharedseceret = p_sharedsecret.xml.value.text
-        return sharedseceret
+            Database._SHAREDSECRETS[base_url] = p_sharedsecret.xml.value.text
+        return Database._SHAREDSECRETS[base_url]
     
     def update(self, **xdict):
         '''Update database
@@ -1444,9 +1731,10 @@ class Database(Element):
         :return: bool (True if needed), lxml.etree.Element (current), lxml.etree.Element of (updated)
         '''
         if 'password' in xdict:
-            xdict_copy = deepcopy(xdict) 
-            xdict_copy['password'] = self.gen_password_hash(xdict['password'], self._get_sharedsecret(xdict))
-        return self._is_update_needed(xdict_copy)
+            # xdict only gets a new password value, a shallow copy is sufficient
+            xdict = dict(xdict)
+            xdict['password'] = self.gen_password_hash(xdict['password'], self._get_sharedsecret(xdict))
+        return self._is_update_needed(xdict)
         
     def gen_password_hash(self, password, salt):
         '''Generate bcrypt hash from plaintext password and salt
@@ -1455,8 +1743,14 @@ class Database(Element):
         :param str salt: Plaintext salt 
         :return: str
         '''
-        salt_sha256 = hashlib.sha256(salt.encode())
-        return bcrypt.hashpw(password, '$2a$13$' + salt_sha256.hexdigest())
+        # bcrypt is a native extension, import it only when a hash is needed
+        import bcrypt
+        if salt not in Database._BCRYPT_SALTS:
+            salt_sha256 = hashlib.sha256(salt.encode())
+            Database._BCRYPT_SALTS[salt] = ('$2a$13$' + salt_sha256.hexdigest()).encode()
+        if not isinstance(password, bytes):
+            password = password.encode('utf-8')
+        return bcrypt.hashpw(password, Database._BCRYPT_SALTS[salt])
 
     def delete(self):
         '''
@@ -1470,12 +1764,13 @@ class Elements(Element):
     '''
         Abstract class of an appNGizer container element
     '''
+    __slots__ = ()
+
     def _get_xml_template(self):
         '''Returns lxml.objectify.ObjectifiedElement template of entity:
         :return: lxml.objectify.ObjectifiedElement
         '''
-        Element = objectify.ElementMaker(annotate=False, namespace=self.XPATH_DEFAULT_NAMESPACE['a'])
-        xml_template = Element(self.TYPE_C.lower())
+        xml_template = self.ELEMENT_MAKER(self._TYPE_C_LOWER)
         return xml_template
     
     def delete(self):
@@ -1503,7 +1798,9 @@ class Sites(Elements):
     TYPE = 'Site'
     TYPE_C = 'Sites'
 
-    SUBELEMENTS = { 'site': [] }
+    __slots__ = ()
+
+    SUBELEMENTS = { 'site': () }
 
 
 
@@ -1513,8 +1810,10 @@ class Repositories(Elements):
     '''
     TYPE = 'Repository'
     TYPE_C = 'Repositories'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'repository': [] }
+    SUBELEMENTS = { 'repository': () }
 
 
 
@@ -1524,8 +1823,10 @@ class Properties(Elements):
     '''
     TYPE = 'Property'
     TYPE_C = 'Properties'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'property': [] }
+    SUBELEMENTS = { 'property': () }
 
 
 
@@ -1537,7 +1838,9 @@ class Applications(Elements):
     TYPE = 'Application'
     TYPE_C = 'Applications'
 
-    SUBELEMENTS = { 'application': [] }
+    __slots__ = ()
+
+    SUBELEMENTS = { 'application': () }
 
 
 
@@ -1547,20 +1850,62 @@ class Packages(Elements):
     '''
     TYPE = 'Package'
     TYPE_C = 'Packages'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'package': [] }
+    SUBELEMENTS = { 'package': () }
     
-    def __init__(self, name=None, parents=[]):
+    # : Number of threads used to query repositories concurrently
+    REPOSITORY_WORKERS = 8
+    # : Seconds a result of :meth:`find` is reused for the same query
+    FIND_CACHE_TTL = 5
+    # Results of find() by (base url, parents, name, filter) as (timestamp, xml_obj)
+    _FIND_CACHE = {}
+    
+    def __init__(self, name=None, parents=None):
         '''
         :param str name: Name of entity
         :param list parents: List of :class:`Element` objects which are parents of the current entity
         '''
         self.name = name
-        self.parents = parents
+        self.parents = [] if parents is None else parents
         self.xml = self._get_xml_template()
         self.loaded = False
+        self.loaded_at = 0
         self.modified = False
+        self.cdata_fields = self.CDATA_FIELDS
         
+    def _get_repositories(self):
+        '''Return list of repositories to search for packages
+
+        If the first parent is a :class:`Repository` only this one is used,
+        otherwise all repositories of the appNG instance are returned.
+
+        :return: list of :class:`Repository` objects
+        '''
+        parents = self.parents
+        if len(parents) > 0:
+            parent = parents[0]
+            if isinstance(parent, Repository):
+                return [parent]
+        repos_obj = Repositories()
+        repos_obj.load()
+        return [Repository(repo.get('name')) for repo in repos_obj.xml.repository]
+
+    def _map_repositories(self, func, repositories):
+        '''Call func for every repository and return the results in order of repositories
+
+        Requests for several repositories are done concurrently with up to
+        self.REPOSITORY_WORKERS threads.
+
+        :param function func: Function which takes a :class:`Repository` object
+        :param list repositories: List of :class:`Repository` objects
+        :return: list
+        '''
+        if len(repositories) < 2:
+            return [func(repo) for repo in repositories]
+        return _pool_map(func, repositories, self.REPOSITORY_WORKERS)
+
     def load(self):
         '''Load entity via GET and set self.xml from requests.Response.content
         :return: None
@@ -1568,19 +1913,11 @@ class Packages(Elements):
         log.debug("Load {0}({1})".format(self.__class__.__name__, self.name))
         
         packages = []
-        repositories = []
-        if len(self.parents) > 0 and type(self.parents[0]) == Repository:
-            repo_obj = self.parents[0]
-            repositories.append(repo_obj)
-        else:
-            repos_obj = Repositories()
-            repos_obj.load()
-            for repo in repos_obj.xml.repository:
-                repo_obj = Repository(repo.get('name'))
-                repositories.append(repo_obj)
+        repositories = self._get_repositories()
+        repo_pkgs = self._map_repositories(lambda repo: repo.list_pkgs(), repositories)
         
-        for repo in repositories:
-            for list_pkg in repo.list_pkgs():
+        for list_pkgs in repo_pkgs:
+            for list_pkg in list_pkgs:
                 if hasattr(list_pkg, 'package'):
                     for pkg in list_pkg.package:
                         packages.append(pkg)
@@ -1588,66 +1925,89 @@ class Packages(Elements):
         self.xml.package = packages
         self.sort_packages_by_version(self.xml)
         self.loaded = True
+        self.loaded_at = time.time()
     
     def find(self, **xdict):
         '''Find all available packages of a package
 
+        Results are cached for self.FIND_CACHE_TTL seconds, every call
+        gets its own copy of the cached result.
+
         :param str xdict['name']*: Name of package
         :param dict xdict['filter']: Dictionary of field:value items to filter packages  
         :return: lxml.objectify.ObjectifiedElement
         '''
+        pkg_name = xdict['name']
+        filter_items = frozenset(xdict.get('filter', {}).items())
+        cache_key = (XMLClient().base_url, tuple([parent.url['self'] for parent in self.parents]),
+                     pkg_name, filter_items)
+        now = time.time()
+        cached = self._FIND_CACHE.get(cache_key)
+        if cached is not None and now - cached[0] < self.FIND_CACHE_TTL:
+            return deepcopy(cached[1])
+        
+        packages_xml = self._find(xdict)
+        # drop expired results, so the cache only holds recent queries
+        for key, (timestamp, _) in list(Packages._FIND_CACHE.items()):
+            if now - timestamp >= self.FIND_CACHE_TTL:
+                Packages._FIND_CACHE.pop(key, None)
+        if self.FIND_CACHE_TTL > 0:
+            Packages._FIND_CACHE[cache_key] = (now, packages_xml)
+        return deepcopy(packages_xml)
+    def _find(self, xdict):
         packages = []
-        repositories = []
+        repositories = self._get_repositories()
+        pkg_name = xdict['name']
+        pkg_filter = [(self.NS_PREFIX + key, value) for key, value in xdict.get('filter', {}).items()]
         
-        if len(self.parents) > 0 and type(self.parents[0]) == Repository:
-            repo_obj = self.parents[0]
-            repositories.append(repo_obj)
-        else:
-            repos_obj = Repositories()
-            repos_obj.load()
-            for repo in repos_obj.xml.repository:
-                repo_obj = Repository(repo.get('name'))
-                repositories.append(repo_obj)
+        repo_pkg_lists = self._map_repositories(lambda repo: repo.list_pkg(name=pkg_name), repositories)
         
-        for repo in repositories:
-            if repo.has_pkg(name=xdict['name']):
-                for list_pkg in repo.list_pkg(name=xdict['name']):
+        for repo, pkg_list in zip(repositories, repo_pkg_lists):
+            if pkg_list is not None:
+                repo_xml = repo.xml
+                for list_pkg in pkg_list:
                     for pkg in list_pkg.package:
-                        if 'filter' in xdict:
-                            filter_ok = True
-                            for key,value in xdict['filter'].iteritems():
-                                if pkg.findtext(self.NS_PREFIX+key) != value:
-                                    filter_ok = False
-                                    break
-                            if filter_ok:
-                                pkg.repository = repo.xml
-                                packages.append(pkg)    
-                        else:
-                            pkg.repository = repo.xml
+                        if all(pkg.findtext(tag) == value for tag, value in pkg_filter):
+                            pkg.repository = repo_xml
                             packages.append(pkg)
 
         packages_xml = self._get_xml_template()
         packages_xml.package = packages
         return self.sort_packages_by_version(packages_xml)
 
+    @classmethod
+    def clear_find_cache(cls):
+        '''Drop all cached results of :meth:`find` and :meth:`Repository.list_pkg`
+        :return: None
+        '''
+        Packages._FIND_CACHE.clear()
+        Repository.clear_pkg_caches()
+
     def sort_packages_by_version(self, xml_obj):
         '''Sort packages by version
 
         :param lxml.objectify.ObjectifiedElement xml_obj: Packages ObjectifiedElement to sort
         :return: lxml.objectify.ObjectifiedElement
         '''
-        packages = xml_obj.find(self.NS_PREFIX+'package')
+        packages = xml_obj.find(self._NS_TAGS['package'])
         data = [] 
         if packages is not None and len(packages) > 0:
             for package in packages:
-                version = package.findtext(self.NS_PREFIX+'version')
-                timestamp = package.findtext(self.NS_PREFIX+'timestamp')
+                # objectify child lookup is cheaper than findtext()
+                version = getattr(package, 'version', None)
+                if version is not None:
+                    version = version.text
+                timestamp = getattr(package, 'timestamp', None)
+                if timestamp is not None:
+                    timestamp = timestamp.text
+                # packages without version are sorted last
                 if version is not None:
-                    lversion = LooseVersion(version)
+                    sort_key = (1, LooseVersion(version), timestamp)
                 else:
-                    lversion = version
-                data.append(( lversion, timestamp, package ))
-            data.sort(reverse=True)
+                    sort_key = (0, None, timestamp)
+                data.append(( sort_key, package ))
+            # sort by key only, so package elements are never compared on ties
+            data.sort(key=lambda item: item[0], reverse=True)
             packages[:] = [item[-1] for item in data]
         return xml_obj
     
@@ -1659,8 +2019,10 @@ class Subjects(Elements):
     '''
     TYPE = 'Subject'
     TYPE_C = 'Subjects'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'subject': [] }
+    SUBELEMENTS = { 'subject': () }
 
 
 
@@ -1670,8 +2032,10 @@ class Groups(Elements):
     '''
     TYPE = 'Group'
     TYPE_C = 'Groups'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'group': [] }
+    SUBELEMENTS = { 'group': () }
 
 
 
@@ -1681,8 +2045,10 @@ class Roles(Elements):
     '''
     TYPE = 'Role'
     TYPE_C = 'Roles'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'role': [] }
+    SUBELEMENTS = { 'role': () }
 
 
 
@@ -1692,8 +2058,10 @@ class Permissions(Elements):
     '''
     TYPE = 'Permission'
     TYPE_C = 'Permissions'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'permission': [] }
+    SUBELEMENTS = { 'permission': () }
 
 
 
@@ -1702,11 +2070,37 @@ class Grants(Elements):
         Class to manage site application grants
     '''
     
-    SUBELEMENTS = { 'grant': [] }
+    SUBELEMENTS = { 'grant': () }
 
     TYPE = 'Grant'
     TYPE_C = 'Grants'
-    
+
+    __slots__ = ('grant_index',)
+
+    def __init__(self, name='', parents=None):
+        '''
+        :param str name: Name of entity
+        :param list parents: List of :class:`Element` objects which are parents of the entity
+        '''
+        super(Grants, self).__init__(name, parents)
+        # : Site name to grant element of self.xml, built on demand
+        self.grant_index = None
+
+    def _set_xml(self, source):
+        self.grant_index = None
+        return super(Grants, self)._set_xml(source)
+
+    def _get_grant_index(self):
+        '''Return dictionary of site names to grant elements, first grant of a site wins
+        :return: dict
+        '''
+        self.load_if_needed()
+        if self.grant_index is None:
+            self.grant_index = {}
+            for g in self.xml.iterchildren(self._NS_TAGS['grant']):
+                self.grant_index.setdefault(g.get('site'), g)
+        return self.grant_index
+
     def get_url_dict(self):
         '''Return dictionary with url path components of the entity
         
@@ -1716,65 +2110,55 @@ class Grants(Elements):
         
         :return: dict
         '''
-        url = {'self': '', 'ancestor': '', 'parents': '', 'type': self.TYPE_C.lower()}
-
-        # Determine parents URL path
-        if hasattr(self, 'parents'):
-            for parent in self.parents:
-                url['parents'] = ''.join([ url['parents'], parent.url['self'] ])
-        # Determine ancestor URL path
-        url['ancestor'] = '/'.join([url['parents'], url['type']])
-        # Determine self URL path
-        if self.name == None:
-            url['self'] = url['ancestor']
-        else:
-            url['self'] = '/'.join([url['ancestor'], self.name])
-        return url
+        return self._get_url_dict(self._TYPE_C_LOWER)
     
     def get_grant(self, name):
         '''Get grant ObjectifiedElement of a site
         :param str name: Name of site
         :return: lxml.objectify.ObjectifiedElement
         '''
-        self.load_if_needed()
-        grant = None
-        if hasattr(self.xml, 'grant') and len(self.xml.grant) > 0:
-            for g in self.xml.grant:
-                if g.get('site') == name:
-                    grant = g
-                    break
-        return grant
+        return self._get_grant_index().get(name)
 
     def update_grant(self, name, is_granted):
         '''Update grant for a site
+
+        If the grant of the site is unknown or already set as requested
+        no request is sent and the current grants are returned.
+
         :param str name: Name of site
         :param bool is_granted: Site is granted to access application
         :return: lxml.objectify.ObjectifiedElement
         '''
-        self.load_if_needed()
-        for g in self.xml.grant:
-            if g.get('site') == name:
-                # Do we really know what we are doing?
-                g._setText(str(is_granted).lower())
-                break
+        g = self._get_grant_index().get(name)
+        is_granted = str(is_granted).lower()
+        if g is None or g.text == is_granted:
+            return self.convert_xml_obj_to_xml_element()
+        # Do we really know what we are doing?
+        g._setText(is_granted)
         request = XMLClient().request('PUT', self.url['self'], self.get_xml_str())
         self._set_xml(request.response)
         self.modified = True
         return self.convert_xml_obj_to_xml_element()
     def update_grants(self, grants=[]):
         '''Update all grants of a site application
+
+        If no grant changes no request is sent and the current grants are returned.
+
         :param list grants: List of grant lxml.objectify.ObjectifiedElements
         :return: lxml.objectify.ObjectifiedElement
         '''
-        self.load_if_needed()
+        grant_index = self._get_grant_index()
+        changed = False
         for arg_g in grants:
             arg_g_site, arg_g_is_granted = arg_g
-            
-            for g in self.xml.grant:
-                if g.get('site') == arg_g_site:
-                    # Do we really know what we are doing?
-                    g._setText(str(arg_g_is_granted).lower())
-                    break
+            g = grant_index.get(arg_g_site)
+            arg_g_is_granted = str(arg_g_is_granted).lower()
+            if g is not None and g.text != arg_g_is_granted:
+                # Do we really know what we are doing?
+                g._setText(arg_g_is_granted)
+                changed = True
+        if not changed:
+            return self.convert_xml_obj_to_xml_element()
         request = XMLClient().request('PUT', self.url['self'], self.get_xml_str())
         self._set_xml(request.response)
         self.modified = True
@@ -1792,24 +2176,21 @@ class Grants(Elements):
         self.load_if_needed()
 
         result = False
-        new_obj = deepcopy(self)
-        new_obj._set_xml(xdict)
-      
-        for ogrant in self.xml.grant:
-          site = ogrant.get('site') 
-          for ngrant in new_obj.xml.grant:
-            if ngrant.get('site') == site:
-              if ogrant.text != ngrant.text:
-                result = True 
-              break
-
-        if len(self.parents) > 0: 
-            parent_types = ' '.join( [p.TYPE for p in self.parents] )
-            log.debug("Update needed for {} {}({}) is {}".format(parent_types, self.__class__.__name__, self.name, str(result)))
-        else:
-            log.debug("Update needed for {}({}) is {}".format(self.__class__.__name__, self.name, str(result)))
+        new_xml = self._get_updated_xml(xdict)
+
+        # map site to grant text once, first grant of a site wins
+        new_grants = {}
+        for ngrant in new_xml.iterchildren(self._NS_TAGS['grant']):
+            new_grants.setdefault(ngrant.get('site'), ngrant.text)
+        for ogrant in self.xml.iterchildren(self._NS_TAGS['grant']):
+            site = ogrant.get('site')
+            if site in new_grants and ogrant.text != new_grants[site]:
+                result = True
+                break
+
+        self._log_update_needed(result)
 
-        return result, self.xml, new_obj.xml
+        return result, self.xml, new_xml
 
 
 
@@ -1819,5 +2200,7 @@ class Databases(Elements):
     '''
     TYPE = 'Database'
     TYPE_C = 'Databases'
+
+    __slots__ = ()
     
-    SUBELEMENTS = { 'database': [] }
+    SUBELEMENTS = { 'database': () }
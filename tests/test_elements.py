@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    Tests for the caches of appngizer.elements against a mocked appNGizer.
+"""
+from __future__ import print_function, absolute_import, division
+
+import pytest
+import requests_mock
+
+import appngizer.client
+from appngizer.elements import Application, Package, Packages, Repository
+
+BASE_URL = 'http://appngizer.test/appNGizer'
+NS = 'xmlns="http://www.appng.org/schema/appngizer"'
+XML_HEADERS = {'Content-Type': 'application/xml'}
+
+
+def repository_xml(name):
+    return ('<repository {} name="{}"><description/><uri>file:///tmp</uri>'
+            '<enabled>true</enabled><strict>false</strict><published>false</published>'
+            '<mode>ALL</mode><type>LOCAL</type><packages/></repository>').format(NS, name)
+
+
+def package_xml(name, installed=False, ns=False):
+    return ('<package {}name="{}"><displayName>{}</displayName><version>1.0.0</version>'
+            '<timestamp>1</timestamp><installed>{}</installed><type>APPLICATION</type>'
+            '</package>').format(NS + ' ' if ns else '', name, name, str(installed).lower())
+
+
+def packages_xml(*packages):
+    return '<packages {}>{}</packages>'.format(NS, ''.join(packages))
+
+
+@pytest.fixture
+def server():
+    '''Mocked appNGizer with a local repository which contains package app'''
+    Packages.clear_find_cache()
+    appngizer.client.Singleton._instances.clear()
+    with requests_mock.Mocker() as mock:
+        mock.post(BASE_URL + '/', text='')
+        appngizer.client.XMLClient(BASE_URL, 'secret')
+        mock.get(BASE_URL + '/repository/local/', text=repository_xml('local'),
+                 headers=XML_HEADERS)
+        mock.get(BASE_URL + '/repository/local/app/', text=packages_xml(package_xml('app')),
+                 headers=XML_HEADERS)
+        yield mock
+    Packages.clear_find_cache()
+    appngizer.client.Singleton._instances.clear()
+
+
+def count_requests(mock, method, path):
+    url = BASE_URL + path
+    return len([r for r in mock.request_history if r.method == method and r.url == url])
+
+
+def set_installed(mock, installed):
+    mock.get(BASE_URL + '/repository/local/app/',
+             text=packages_xml(package_xml('app', installed=installed)), headers=XML_HEADERS)
+
+
+def test_find_is_cached(server):
+    repo = Repository('local')
+    Packages(parents=[repo]).find(name='app')
+    Packages(parents=[repo]).find(name='app')
+    assert count_requests(server, 'GET', '/repository/local/app/') == 1
+
+
+def test_find_cache_expired_entries_are_dropped(server, monkeypatch):
+    monkeypatch.setattr(Packages, 'FIND_CACHE_TTL', 0)
+    Packages(parents=[Repository('local')]).find(name='app')
+    Packages(parents=[Repository('local')]).find(name='app')
+    assert Packages._FIND_CACHE == {}
+    assert count_requests(server, 'GET', '/repository/local/app/') == 2
+
+
+def test_find_cache_is_keyed_by_base_url(server):
+    Packages(parents=[Repository('local')]).find(name='app')
+    other_url = 'http://other.test/appNGizer'
+    server.post(other_url + '/', text='')
+    server.get(other_url + '/repository/local/app/', status_code=404)
+    appngizer.client.XMLClient(other_url, 'secret')
+    found = Packages(parents=[Repository('local')]).find(name='app')
+    assert not hasattr(found, 'package')
+
+
+def test_install_clears_caches(server):
+    repo = Repository('local')
+    server.put(BASE_URL + '/repository/local/install/',
+               text=package_xml('app', installed=True, ns=True), headers=XML_HEADERS)
+    package = Package('app', parents=[repo])
+    package.install()
+    set_installed(server, True)
+    assert package.is_installed(type='TEMPLATE')
+
+
+def test_application_delete_clears_caches(server):
+    repo = Repository('local')
+    set_installed(server, True)
+    assert Package('app', parents=[repo]).is_installed(type='TEMPLATE')
+    server.get(BASE_URL + '/site/', text='<sites {}/>'.format(NS), headers=XML_HEADERS)
+    server.delete(BASE_URL + '/application/app/', status_code=204)
+    Application('app').delete()
+    set_installed(server, False)
+    found = Packages(parents=[repo]).find(name='app', filter={'installed': 'true'})
+    assert not hasattr(found, 'package')
+
+
+def test_repository_update_clears_caches(server):
+    repo = Repository('local')
+    server.get(BASE_URL + '/repository/local/other/', status_code=404)
+    assert not repo.has_pkg(name='other')
+    server.get(BASE_URL + '/repository/local/other/', text=packages_xml(package_xml('other')),
+               headers=XML_HEADERS)
+    server.put(BASE_URL + '/repository/local/', text=repository_xml('local'),
+               headers=XML_HEADERS)
+    Repository('local').update(description='updated')
+    assert repo.has_pkg(name='other')
+
+
+def test_list_pkg_cache_expires(server, monkeypatch):
+    repo = Repository('local')
+    server.get(BASE_URL + '/repository/local/other/', status_code=404)
+    assert not repo.has_pkg(name='other')
+    server.get(BASE_URL + '/repository/local/other/', text=packages_xml(package_xml('other')),
+               headers=XML_HEADERS)
+    assert not repo.has_pkg(name='other')
+    monkeypatch.setattr(Repository, 'PKG_CACHE_TTL', 0)
+    assert repo.has_pkg(name='other')
+
+
+def test_exist_after_delete(server):
+    app_xml = ('<application {} name="app"><displayName>app</displayName><privileged>false'
+               '</privileged><fileBased>true</fileBased><hidden>false</hidden>'
+               '<version>1.0.0</version></application>').format(NS)
+    server.get(BASE_URL + '/application/app/', text=app_xml, headers=XML_HEADERS)
+    server.get(BASE_URL + '/site/', text='<sites {}/>'.format(NS), headers=XML_HEADERS)
+    server.delete(BASE_URL + '/application/app/', status_code=204)
+    app = Application('app')
+    assert app.exist()
+    app.delete()
+    server.get(BASE_URL + '/application/app/', status_code=404)
+    assert not app.exist()